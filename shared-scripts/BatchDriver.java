@@ -0,0 +1,148 @@
+// Long-lived host for the Java CLI, started by batch_driver.py.
+// Usage: java -cp cli.jar BatchDriver.java <cli.jar>
+// Reads "<id>\t<arg>\t<arg>..." requests from stdin and invokes the jar's
+// Main-Class in this JVM for each one, capturing System.out/System.err.
+// The capture streams are installed once, before the CLI is loaded, and only
+// their target buffer changes per request, so loggers that keep a reference
+// to System.err (e.g. java.util.logging.ConsoleHandler) are captured too.
+// Writes one "BATCH_RESULT <json>" line per request to stdout. If the CLI
+// calls System.exit, a shutdown hook reports the in-flight request with a
+// null returncode so the caller can take the JVM exit code and resubmit the rest.
+
+import java.io.BufferedReader;
+import java.io.ByteArrayOutputStream;
+import java.io.FileDescriptor;
+import java.io.FileOutputStream;
+import java.io.InputStreamReader;
+import java.io.IOException;
+import java.io.OutputStream;
+import java.io.PrintStream;
+import java.lang.reflect.InvocationTargetException;
+import java.lang.reflect.Method;
+import java.nio.charset.StandardCharsets;
+import java.util.Arrays;
+import java.util.jar.JarFile;
+
+public class BatchDriver {
+
+    private static final String RESULT_PREFIX = "BATCH_RESULT ";
+
+    private static final PrintStream RESULTS =
+            new PrintStream(new FileOutputStream(FileDescriptor.out), true, StandardCharsets.UTF_8);
+
+    // Where the CLI's output goes outside of a request: the real stderr, which
+    // keeps stdout reserved for BATCH_RESULT lines.
+    private static final OutputStream IDLE = new FileOutputStream(FileDescriptor.err);
+
+    private static final SwitchableOutputStream CLI_OUT = new SwitchableOutputStream(IDLE);
+    private static final SwitchableOutputStream CLI_ERR = new SwitchableOutputStream(IDLE);
+
+    private static volatile String currentId;
+    private static volatile ByteArrayOutputStream currentOut;
+    private static volatile ByteArrayOutputStream currentErr;
+
+    public static void main(String[] args) throws Exception {
+        System.setOut(new PrintStream(CLI_OUT, true, StandardCharsets.UTF_8));
+        System.setErr(new PrintStream(CLI_ERR, true, StandardCharsets.UTF_8));
+
+        String mainClassName;
+        try (JarFile jar = new JarFile(args[0])) {
+            mainClassName = jar.getManifest().getMainAttributes().getValue("Main-Class");
+        }
+        Method cliMain = Class.forName(mainClassName).getMethod("main", String[].class);
+
+        Runtime.getRuntime().addShutdownHook(new Thread(() -> {
+            if (currentId != null) {
+                emit(currentId, null, currentOut, currentErr);
+            }
+        }));
+
+        BufferedReader requests = new BufferedReader(new InputStreamReader(System.in, StandardCharsets.UTF_8));
+        String line;
+        while ((line = requests.readLine()) != null) {
+            if (line.isEmpty()) {
+                continue;
+            }
+            String[] fields = line.split("\t", -1);
+            String[] cliArgs = Arrays.copyOfRange(fields, 1, fields.length);
+
+            currentOut = new ByteArrayOutputStream();
+            currentErr = new ByteArrayOutputStream();
+            CLI_OUT.target = currentOut;
+            CLI_ERR.target = currentErr;
+            currentId = fields[0];
+
+            int returncode = 0;
+            try {
+                cliMain.invoke(null, (Object) cliArgs);
+            } catch (InvocationTargetException e) {
+                e.getCause().printStackTrace();
+                returncode = 1;
+            } finally {
+                System.out.flush();
+                System.err.flush();
+                CLI_OUT.target = IDLE;
+                CLI_ERR.target = IDLE;
+            }
+
+            emit(fields[0], returncode, currentOut, currentErr);
+            currentId = null;
+        }
+
+        // Non-daemon threads left behind by the CLI must not keep the host alive
+        System.exit(0);
+    }
+
+    /** Output stream whose destination can be swapped between requests. */
+    private static final class SwitchableOutputStream extends OutputStream {
+
+        private volatile OutputStream target;
+
+        SwitchableOutputStream(OutputStream target) {
+            this.target = target;
+        }
+
+        @Override
+        public void write(int b) throws IOException {
+            target.write(b);
+        }
+
+        @Override
+        public void write(byte[] b, int off, int len) throws IOException {
+            target.write(b, off, len);
+        }
+
+        @Override
+        public void flush() throws IOException {
+            target.flush();
+        }
+    }
+
+    private static synchronized void emit(String id, Integer returncode, ByteArrayOutputStream out, ByteArrayOutputStream err) {
+        RESULTS.println(RESULT_PREFIX + "{\"id\": " + quote(id)
+                + ", \"returncode\": " + returncode
+                + ", \"stdout\": " + quote(out.toString(StandardCharsets.UTF_8))
+                + ", \"stderr\": " + quote(err.toString(StandardCharsets.UTF_8)) + "}");
+    }
+
+    private static String quote(String value) {
+        StringBuilder json = new StringBuilder("\"");
+        for (char c : value.toCharArray()) {
+            switch (c) {
+                case '"' -> json.append("\\\"");
+                case '\\' -> json.append("\\\\");
+                case '\n' -> json.append("\\n");
+                case '\r' -> json.append("\\r");
+                case '\t' -> json.append("\\t");
+                default -> {
+                    if (c < 0x20 || c > 0x7e) {
+                        json.append(String.format("\\u%04x", (int) c));
+                    } else {
+                        json.append(c);
+                    }
+                }
+            }
+        }
+        return json.append('"').toString();
+    }
+}
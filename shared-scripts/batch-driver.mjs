@@ -0,0 +1,47 @@
+#!/usr/bin/env node
+// Long-lived host for the JavaScript CLI, started by batch_driver.py.
+// Usage: node batch-driver.mjs <cli-entry>
+// Reads "<id>\t<arg>\t<arg>..." requests from stdin and runs each one as the
+// CLI entry point in a worker thread, so the CLI keeps its own process.argv,
+// process.exit() and async lifecycle without a new Node process per command.
+// The entry point runs one command when imported, so each worker evaluates
+// the CLI's module graph again; only Node startup is shared.
+// Writes one "BATCH_RESULT <json>" line per request to stdout.
+import { Worker } from 'node:worker_threads';
+import { createInterface } from 'node:readline';
+import { once } from 'node:events';
+
+const RESULT_PREFIX = 'BATCH_RESULT ';
+const cliEntry = process.argv[2];
+
+function collect(stream) {
+    let text = '';
+    stream.setEncoding('utf8');
+    stream.on('data', chunk => { text += chunk; });
+    return once(stream, 'end').then(() => text);
+}
+
+async function runCli(args) {
+    const worker = new Worker(cliEntry, { argv: args, stdout: true, stderr: true });
+    const stdout = collect(worker.stdout);
+    const stderr = collect(worker.stderr);
+
+    // Uncaught errors end the worker with exit code 1, like an unhandled
+    // rejection in a standalone CLI run; keep the stack for the report.
+    let uncaught = '';
+    worker.on('error', err => { uncaught += `${err && err.stack ? err.stack : err}\n`; });
+
+    // events.once() would reject on 'error', so wait for 'exit' explicitly.
+    const returncode = await new Promise(resolve => worker.on('exit', resolve));
+    return { returncode, stdout: await stdout, stderr: (await stderr) + uncaught };
+}
+
+const requests = createInterface({ input: process.stdin, crlfDelay: Infinity });
+for await (const line of requests) {
+    if (!line) {
+        continue;
+    }
+    const [id, ...args] = line.split('\t');
+    const result = await runCli(args);
+    process.stdout.write(`${RESULT_PREFIX}${JSON.stringify({ id, ...result })}\n`);
+}
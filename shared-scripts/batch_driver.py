@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Batch driver for the Exhort CLI.
+
+Runs every analysis for one or more scenarios inside a single long-lived CLI
+host process instead of launching the CLI once per command:
+
+  java:        BatchDriver.java is started once with cli.jar on the classpath
+               and invokes the jar's Main-Class in-process for each command.
+  javascript:  cli.tgz is installed once and batch-driver.mjs runs the CLI
+               entry point in a worker thread per command, so process.exit()
+               and pending async work behave exactly as in a standalone run.
+               Only Node startup and package resolution are shared; each
+               worker still evaluates the CLI's module graph afresh.
+
+Each result comes back as a subprocess.CompletedProcess keyed by the command
+string from get_commands(), so run_tests.py validates it unchanged.
+
+Protocol: requests are written to the host's stdin, one per line, as the
+request id followed by the CLI arguments, tab-separated. The host answers with
+one "BATCH_RESULT <json>" line per request carrying id, returncode, stdout and
+stderr. A null returncode means the CLI terminated the host (e.g. a Java CLI
+calling System.exit on error); the host's exit code is used instead and the
+remaining requests are resubmitted to a fresh host.
+"""
+
+import json
+import shutil
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+from common_test_functions import get_cli_args
+
+RESULT_PREFIX = "BATCH_RESULT "
+
+SCRIPT_DIR = Path(__file__).parent
+
+
+def get_batch_requests(commands: List[str], manifest_arg: str) -> List[Tuple[str, List[str]]]:
+    """Pair each command string from get_commands() with its CLI arguments."""
+    return list(zip(commands, get_cli_args(manifest_arg)))
+
+
+def install_javascript_cli(cli_dir: str, install_dir: Path) -> Path:
+    """Install cli.tgz once and return the path to its CLI entry point."""
+    cli_tgz = Path(cli_dir).resolve() / "cli.tgz"
+    npm = shutil.which("npm") or "npm"
+    subprocess.run(
+        [npm, "install", "--no-audit", "--no-fund",
+         "--prefix", str(install_dir), str(cli_tgz)],
+        check=True, capture_output=True, text=True
+    )
+
+    with open(install_dir / "package.json") as f:
+        package_name = next(iter(json.load(f)["dependencies"]))
+
+    package_dir = install_dir / "node_modules" / package_name
+    with open(package_dir / "package.json") as f:
+        bin_field = json.load(f)["bin"]
+
+    entry = bin_field if isinstance(bin_field, str) else next(iter(bin_field.values()))
+    return (package_dir / entry).resolve()
+
+
+def get_host_command(language: str, cli_dir: str, install_dir: Path) -> List[str]:
+    """Get the command that starts the long-lived CLI host process."""
+    if language == "java":
+        cli_jar = str(Path(cli_dir).resolve() / "cli.jar")
+        return ["java", "-cp", cli_jar, str(SCRIPT_DIR / "BatchDriver.java"), cli_jar]
+    if language == "javascript":
+        entry = install_javascript_cli(cli_dir, install_dir)
+        return ["node", str(SCRIPT_DIR / "batch-driver.mjs"), str(entry)]
+
+    print(f"Unknown language: {language}", file=sys.stderr)
+    sys.exit(1)
+
+
+def run_host(host_command: List[str], pending: List[Tuple[int, List[str]]]) -> Tuple[List[Dict], subprocess.CompletedProcess]:
+    """Start one host process, feed it the pending requests and collect its results."""
+    request_lines = ["\t".join([str(request_id)] + args) for request_id, args in pending]
+    host = subprocess.run(
+        host_command, input="\n".join(request_lines) + "\n",
+        capture_output=True, text=True, encoding="utf-8"
+    )
+
+    records = []
+    for line in host.stdout.splitlines():
+        if not line.startswith(RESULT_PREFIX):
+            continue
+        try:
+            records.append(json.loads(line[len(RESULT_PREFIX):]))
+        except json.JSONDecodeError:
+            print(f"  WARN Ignoring malformed batch result: {line[:200]}")
+    return records, host
+
+
+def run_batch(language: str, cli_dir: str, requests: List[Tuple[str, List[str]]]) -> Dict[str, subprocess.CompletedProcess]:
+    """Run all requests through a single CLI host, returning results by command string."""
+    results: Dict[str, subprocess.CompletedProcess] = {}
+    pending = list(enumerate(args for _, args in requests))
+    commands = [cmd for cmd, _ in requests]
+
+    with tempfile.TemporaryDirectory(prefix="exhort-batch-") as install_dir:
+        try:
+            host_command = get_host_command(language, cli_dir, Path(install_dir))
+        except (subprocess.CalledProcessError, OSError, KeyError, StopIteration) as e:
+            print(f"  FAIL Could not prepare batch driver: {e}")
+            sys.exit(1)
+
+        host_launches = 0
+        while pending:
+            host_launches += 1
+            try:
+                records, host = run_host(host_command, pending)
+            except OSError as e:
+                print(f"  FAIL Could not start batch driver: {e}")
+                sys.exit(1)
+
+            for record in records:
+                request_id = int(record["id"])
+                returncode = record["returncode"]
+                if returncode is None:
+                    returncode = host.returncode
+                results[commands[request_id]] = subprocess.CompletedProcess(
+                    commands[request_id], returncode, record["stdout"], record["stderr"]
+                )
+
+            done = {int(record["id"]) for record in records}
+            if not done:
+                # The host died before answering anything; charge the failure to
+                # the first pending request so the loop always makes progress.
+                request_id = pending[0][0]
+                results[commands[request_id]] = subprocess.CompletedProcess(
+                    commands[request_id], host.returncode or 1, host.stdout, host.stderr
+                )
+                done.add(request_id)
+
+            pending = [(request_id, args) for request_id, args in pending if request_id not in done]
+
+    print(f"Batch driver ran {len(requests)} commands in {host_launches} {language} process(es)")
+    return results
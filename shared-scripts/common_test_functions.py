@@ -9,6 +9,7 @@ for each scenario.
 """
 
 import os
+import platform
 import sys
 from pathlib import Path
 from typing import Dict, Any, List, Optional
@@ -102,6 +103,46 @@ def get_scenario_base_dir(runtime: str) -> str:
 
     return runtime
 
+def get_os_name() -> str:
+    """Map platform.system() to OS name for spec.yaml overrides."""
+    system = platform.system()
+    if system == "Windows":
+        return "windows"
+    elif system == "Darwin":
+        return "macos"
+    elif system == "Linux":
+        return "linux"
+    else:
+        return "unknown"
+
+def get_transitive_key(exp_scanned: Dict[str, Any]) -> Optional[str]:
+    """Get the spec.yaml scanned key holding the expected transitive count on this OS.
+
+    An OS-specific override (transitive_<os>) takes precedence over the base
+    transitive field; returns None if neither is present.
+    """
+    transitive_key = f"transitive_{get_os_name()}"
+    if transitive_key in exp_scanned:
+        return transitive_key
+    if "transitive" in exp_scanned:
+        return "transitive"
+    return None
+
+def get_cli_args(manifest_arg: str) -> List[List[str]]:
+    """Get the CLI arguments for each analysis run against a manifest.
+
+    The order matches the commands returned by get_commands(), so callers that
+    drive the CLI in-process (see batch_driver.py) can pair each argument list
+    with the command string the validators dispatch on.
+    """
+    return [
+        ["component", manifest_arg],
+        ["stack", manifest_arg],
+        ["stack", manifest_arg, "--summary"],
+        ["stack", manifest_arg, "--html"],
+        ["license", manifest_arg]
+    ]
+
 def get_commands(language: str, cli_dir: str, scenario_dir: str, manifest: str) -> List[str]:
     """Get the commands to run for a scenario."""
     commands = []
@@ -110,32 +151,20 @@ def get_commands(language: str, cli_dir: str, scenario_dir: str, manifest: str)
     cli_path = Path(cli_dir).resolve()
     scenario_path = Path(scenario_dir).resolve()
     manifest_path = scenario_path / manifest
+    manifest_arg = str(manifest_path)
     
     if language == "javascript":
         # For file:// URLs, we need forward slashes even on Windows
         cli_url_path = cli_path.as_posix()
-        manifest_arg = str(manifest_path)
-        
-        commands.extend([
-            f"npx --yes file:///{cli_url_path}/cli.tgz component {manifest_arg}",
-            f"npx --yes file:///{cli_url_path}/cli.tgz stack {manifest_arg}",
-            f"npx --yes file:///{cli_url_path}/cli.tgz stack {manifest_arg} --summary",
-            f"npx --yes file:///{cli_url_path}/cli.tgz stack {manifest_arg} --html",
-            f"npx --yes file:///{cli_url_path}/cli.tgz license {manifest_arg}"
-        ])
+        launcher = f"npx --yes file:///{cli_url_path}/cli.tgz"
     elif language == "java":
         cli_jar = cli_path / "cli.jar"
-        manifest_arg = str(manifest_path)
-        
-        commands.extend([
-            f"java -jar {cli_jar} component {manifest_arg}",
-            f"java -jar {cli_jar} stack {manifest_arg}",
-            f"java -jar {cli_jar} stack {manifest_arg} --summary",
-            f"java -jar {cli_jar} stack {manifest_arg} --html",
-            f"java -jar {cli_jar} license {manifest_arg}"
-        ])
+        launcher = f"java -jar {cli_jar}"
     else:
         print(f"Unknown language: {language}", file=sys.stderr)
         sys.exit(1)
+
+    for args in get_cli_args(manifest_arg):
+        commands.append(" ".join([launcher] + args))
     
-    return commands 
\ No newline at end of file
+    return commands 
@@ -0,0 +1,407 @@
+#!/usr/bin/env python3
+"""
+Local lockfile oracle for expected dependency counts.
+
+Parses the lockfiles committed with each scenario (package-lock.json,
+pnpm-lock.yaml, yarn.lock classic and berry, go.sum) and computes
+the direct/transitive counts of the resolved dependency graph without running
+the CLI or contacting the backend. Parsers stream the line-oriented formats
+instead of loading a YAML/TOML document, so a full check takes milliseconds.
+
+Counting rule (matches the CLI's scanned block for the JavaScript lockfiles):
+  direct:     packages the project itself depends on (dev dependencies excluded)
+  transitive: distinct name@version packages reached through at least one
+              dependency edge from the direct ones, so a direct package that is
+              also required by another package counts here as well
+
+Only the JavaScript lockfiles are exact. go.sum records no dependency edges at
+all (every module version in it other than the go.mod requirements counts as
+transitive), so mismatches for it are reported as WARN rather than FAIL, and
+run_tests.py does not check the CLI's output against it.
+
+The cargo scenario has no committed Cargo.lock (cargo resolves it at run time),
+so it is not covered.
+
+Usage: python lockfile_oracle.py [runtime ...]
+  Cross-checks scanned.direct/transitive in each scenario's spec.yaml against
+  its lockfile and exits non-zero on any mismatch for an exact lockfile. With
+  no runtime arguments, every scenario that has a lockfile is checked.
+"""
+
+import json
+import re
+import sys
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+
+import yaml
+
+from common_test_functions import get_manifest_file, get_scenario_base_dir, get_transitive_key
+
+# A dependency graph: the node ids the project depends on directly, and the
+# adjacency of every resolved package. Node ids are "name@version".
+LockGraph = Tuple[Set[str], Dict[str, Set[str]]]
+
+# One runtime per scenario directory that ships a lockfile
+LOCKFILE_RUNTIMES = ["npm", "pnpm", "yarn-classic", "yarn-berry", "go-latest"]
+
+# Lockfiles that record the full resolved graph, so their counts are exact
+EXACT_LOCKFILES = {"package-lock.json", "pnpm-lock.yaml", "yarn.lock"}
+
+PNPM_PEER_SUFFIX = re.compile(r"\(.*\)$")
+
+
+def get_lockfile(runtime: str) -> Optional[str]:
+    """Get the lockfile name based on runtime, or None if the ecosystem has none."""
+    runtime = runtime.lower()
+
+    if runtime.startswith("go"):
+        return "go.sum"
+
+    lockfile_map = {
+        "npm": "package-lock.json",
+        "pnpm": "pnpm-lock.yaml",
+        "yarn-classic": "yarn.lock",
+        "yarn-berry": "yarn.lock"
+    }
+    return lockfile_map.get(runtime)
+
+
+def unquote(value: str) -> str:
+    """Strip surrounding single or double quotes from a lockfile token."""
+    value = value.strip()
+    if len(value) >= 2 and value[0] == value[-1] and value[0] in "\"'":
+        return value[1:-1]
+    return value
+
+
+def yaml_key(text: str) -> str:
+    """Get the (possibly quoted) mapping key from a "key: value" YAML line."""
+    if text[0] in "\"'":
+        return text[1:text.index(text[0], 1)]
+    return text.split(":", 1)[0]
+
+
+def split_name_spec(descriptor: str) -> Tuple[str, str]:
+    """Split "name@spec" (name may be scoped, e.g. "@babel/core@^7") into its parts."""
+    at = descriptor.index("@", 1)
+    return descriptor[:at], descriptor[at + 1:]
+
+
+def read_lines(path: Path) -> Iterator[str]:
+    """Yield the lines of a lockfile without trailing newlines."""
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            yield line.rstrip("\r\n")
+
+
+def parse_package_lock(path: Path) -> LockGraph:
+    """Parse an npm package-lock.json (lockfileVersion 2 or 3)."""
+    with open(path, encoding="utf-8") as f:
+        packages = json.load(f)["packages"]
+
+    def resolve(install_path: str, name: str) -> Optional[str]:
+        # Walk up the node_modules hierarchy the same way Node's resolver does
+        base = install_path
+        while True:
+            candidate = f"{base}/node_modules/{name}" if base else f"node_modules/{name}"
+            if candidate in packages:
+                return candidate
+            if not base:
+                return None
+            cut = base.rfind("/node_modules/")
+            base = base[:cut] if cut >= 0 else ""
+
+    def node_id(install_path: str) -> str:
+        name = install_path.rsplit("node_modules/", 1)[-1]
+        return f"{name}@{packages[install_path]['version']}"
+
+    graph: Dict[str, Set[str]] = {}
+    for install_path, entry in packages.items():
+        if not install_path or entry.get("dev") or "version" not in entry:
+            continue
+        children = graph.setdefault(node_id(install_path), set())
+        # npm 7+ installs peer dependencies, and the CLI's tree includes them
+        for name in (list(entry.get("dependencies", {})) + list(entry.get("optionalDependencies", {})) +
+                     list(entry.get("peerDependencies", {}))):
+            target = resolve(install_path, name)
+            if target and not packages[target].get("dev"):
+                children.add(node_id(target))
+
+    root = packages.get("", {})
+    direct = set()
+    for name in list(root.get("dependencies", {})) + list(root.get("optionalDependencies", {})):
+        target = resolve("", name)
+        if target:
+            direct.add(node_id(target))
+    return direct, graph
+
+
+def parse_pnpm_lock(path: Path) -> LockGraph:
+    """Parse a pnpm-lock.yaml (lockfileVersion 9, with a snapshots section)."""
+    direct: Set[str] = set()
+    graph: Dict[str, Set[str]] = {}
+    section = ""
+    importer = ""
+    current: Optional[Set[str]] = None
+    dep_group = ""
+    pending_name = ""
+
+    for line in read_lines(path):
+        if not line.strip():
+            continue
+        indent = len(line) - len(line.lstrip(" "))
+        text = line.strip()
+
+        if indent == 0:
+            section = text.rstrip(":")
+            continue
+
+        if section == "importers":
+            if indent == 2:
+                importer = yaml_key(text)
+            elif indent == 4:
+                dep_group = text.rstrip(":")
+            elif importer == "." and dep_group in ("dependencies", "optionalDependencies"):
+                if indent == 6:
+                    pending_name = yaml_key(text)
+                elif indent == 8 and text.startswith("version:"):
+                    version = PNPM_PEER_SUFFIX.sub("", unquote(text.split(":", 1)[1]))
+                    direct.add(f"{pending_name}@{version}")
+
+        elif section == "snapshots":
+            if indent == 2:
+                current = graph.setdefault(PNPM_PEER_SUFFIX.sub("", yaml_key(text)), set())
+                dep_group = ""
+            elif indent == 4:
+                dep_group = text.rstrip(":")
+            elif indent == 6 and current is not None and dep_group in ("dependencies", "optionalDependencies"):
+                version = PNPM_PEER_SUFFIX.sub("", unquote(text.rpartition(": ")[2]))
+                current.add(f"{yaml_key(text)}@{version}")
+
+    return direct, graph
+
+
+def parse_yarn_lock(path: Path, manifest: Path) -> LockGraph:
+    """Parse a yarn.lock in either the classic (v1) or berry (__metadata) format."""
+    berry = False
+    descriptors: Dict[str, str] = {}
+    entries: List[Tuple[str, List[Tuple[str, str]]]] = []
+    workspace_deps: List[Tuple[str, str]] = []
+    keys: List[str] = []
+    version = ""
+    deps: List[Tuple[str, str]] = []
+    in_deps = False
+
+    def flush() -> None:
+        if not keys:
+            return
+        if any("@workspace:" in key for key in keys):
+            workspace_deps.extend(deps)
+            return
+        node = f"{split_name_spec(keys[0])[0]}@{version}"
+        for key in keys:
+            descriptors[key] = node
+        entries.append((node, list(deps)))
+
+    for line in read_lines(path):
+        if not line.strip() or line.startswith("#"):
+            continue
+        indent = len(line) - len(line.lstrip(" "))
+        text = line.strip()
+
+        if indent == 0:
+            flush()
+            keys, version, deps, in_deps = [], "", [], False
+            if text == "__metadata:":
+                berry = True
+                continue
+            # Classic quotes each descriptor, berry quotes the whole list
+            keys = text[:-1].replace('"', "").split(", ")
+        elif indent == 2:
+            in_deps = text in ("dependencies:", "optionalDependencies:")
+            if text.startswith("version"):
+                version = unquote(text[len("version"):].lstrip(":").strip())
+        elif indent == 4 and in_deps:
+            if berry:
+                name, _, spec = text.partition(": ")
+            else:
+                name, _, spec = text.partition(" ")
+            deps.append((unquote(name), unquote(spec)))
+    flush()
+
+    graph: Dict[str, Set[str]] = {}
+    for node, node_deps in entries:
+        children = graph.setdefault(node, set())
+        for name, spec in node_deps:
+            target = descriptors.get(f"{name}@{spec}")
+            if target:
+                children.add(target)
+
+    if not workspace_deps:
+        # Classic lockfiles have no root entry; the manifest lists the direct deps
+        with open(manifest, encoding="utf-8") as f:
+            package_json = json.load(f)
+        for group in ("dependencies", "optionalDependencies"):
+            workspace_deps.extend(package_json.get(group, {}).items())
+
+    direct = set()
+    for name, spec in workspace_deps:
+        target = descriptors.get(f"{name}@{spec}") or descriptors.get(f"{name}@npm:{spec}")
+        if target:
+            direct.add(target)
+    return direct, graph
+
+
+def parse_go_sum(path: Path, manifest: Path) -> LockGraph:
+    """Parse go.sum module versions, taking direct requirements from go.mod."""
+    modules: Set[str] = set()
+    for line in read_lines(path):
+        fields = line.split()
+        if len(fields) >= 2:
+            modules.add(f"{fields[0]}@{fields[1].split('/', 1)[0]}")
+
+    direct: Set[str] = set()
+    in_require = False
+    for line in read_lines(manifest):
+        indirect = "// indirect" in line
+        text = line.split("//", 1)[0].strip()
+        if text.startswith("require ("):
+            in_require = True
+        elif in_require and text == ")":
+            in_require = False
+        elif indirect:
+            continue
+        elif in_require and text:
+            module, version = text.split()[:2]
+            direct.add(f"{module}@{version}")
+        elif text.startswith("require "):
+            module, version = text.split()[1:3]
+            direct.add(f"{module}@{version}")
+
+    # Without edges in go.sum, let every direct module reach all the others
+    graph: Dict[str, Set[str]] = {module: set() for module in modules}
+    for module in direct:
+        graph[module] = modules - direct
+    return direct, graph
+
+
+def parse_lockfile(runtime: str, scenario_dir: Path) -> Optional[LockGraph]:
+    """Parse the scenario's lockfile for the runtime, or None if there isn't one."""
+    lockfile = get_lockfile(runtime)
+    if not lockfile or not (scenario_dir / lockfile).exists():
+        return None
+
+    path = scenario_dir / lockfile
+    manifest = scenario_dir / get_manifest_file(runtime)
+    if lockfile == "package-lock.json":
+        return parse_package_lock(path)
+    if lockfile == "pnpm-lock.yaml":
+        return parse_pnpm_lock(path)
+    if lockfile == "yarn.lock":
+        return parse_yarn_lock(path, manifest)
+    return parse_go_sum(path, manifest)
+
+
+def count_dependencies(lock_graph: LockGraph) -> Dict[str, int]:
+    """Count direct and transitive packages in a parsed lockfile graph."""
+    direct, graph = lock_graph
+    reachable: Set[str] = set()
+    stack = list(direct)
+    while stack:
+        for child in graph.get(stack.pop(), ()):
+            if child not in reachable:
+                reachable.add(child)
+                stack.append(child)
+
+    return {"direct": len(direct), "transitive": len(reachable), "total": len(direct) + len(reachable)}
+
+
+def get_expected_counts(runtime: str, scenario_dir: Path) -> Optional[Dict[str, int]]:
+    """Get the lockfile-derived counts for a scenario, or None if it has no lockfile."""
+    lock_graph = parse_lockfile(runtime, scenario_dir)
+    if lock_graph is None:
+        return None
+    return count_dependencies(lock_graph)
+
+
+def compare_counts(scanned: Dict[str, int], counts: Dict[str, int], exact: bool, context: str,
+                   exp_scanned: Dict[str, Any]) -> bool:
+    """Compare a scanned block's direct/transitive counts with lockfile counts.
+
+    Mismatches fail only for exact lockfiles; otherwise they are warnings.
+    Lockfiles are OS-independent, so when spec.yaml overrides the transitive
+    count for this OS (transitive_<os>) only the direct count is compared. A
+    spec without any transitive field has no override, so both are compared.
+    """
+    fields = ["direct"]
+    if get_transitive_key(exp_scanned) in (None, "transitive"):
+        fields.append("transitive")
+    else:
+        print(f"  WARN {context} has a transitive override for this OS, "
+              f"comparing only the direct count with the lockfile")
+
+    ok = True
+    for field in fields:
+        if field in scanned and scanned[field] != counts[field]:
+            level = "FAIL" if exact else "WARN"
+            print(f"  {level} {context} scanned.{field}: {scanned[field]}, lockfile: {counts[field]}")
+            ok = False
+
+    if ok:
+        compared = ", ".join(f"{field} {counts[field]}" for field in fields)
+        print(f"  PASS {context} matches lockfile ({compared})")
+    return ok or not exact
+
+
+def validate_scanned(scanned: Dict[str, int], exp_scanned: Dict[str, Any], runtime: str,
+                     scenario_dir: Path) -> bool:
+    """Confirm the CLI's stack analysis scanned block against the scenario's lockfile.
+
+    Only exact lockfiles are checked; approximate ones (go.sum) would warn on
+    every run and bury real drift, so they are left to the standalone report.
+    """
+    if get_lockfile(runtime) not in EXACT_LOCKFILES:
+        return True
+    counts = get_expected_counts(runtime, scenario_dir)
+    if counts is None:
+        return True
+    return compare_counts(scanned, counts, True, "stack_analysis", exp_scanned)
+
+
+def validate_spec_counts(runtime: str, scenario_dir: Path) -> bool:
+    """Cross-check stack_analysis.scanned in spec.yaml against the lockfile."""
+    counts = get_expected_counts(runtime, scenario_dir)
+    if counts is None:
+        print(f"  WARN No {get_lockfile(runtime) or 'lockfile'} for {scenario_dir}, skipping")
+        return True
+
+    with open(scenario_dir / "spec.yaml") as f:
+        exp_scanned = yaml.safe_load(f)["stack_analysis"].get("scanned", {})
+
+    return compare_counts(exp_scanned, counts, get_lockfile(runtime) in EXACT_LOCKFILES,
+                          f"{scenario_dir.name} spec.yaml", exp_scanned)
+
+
+def main():
+    runtimes = sys.argv[1:] or LOCKFILE_RUNTIMES
+    scenarios_root = Path(__file__).parent.parent / "scenarios"
+
+    success = True
+    for runtime in runtimes:
+        scenarios_dir = scenarios_root / get_scenario_base_dir(runtime)
+        if not scenarios_dir.exists():
+            print(f"No scenarios found for runtime: {runtime}")
+            continue
+
+        print(f"Runtime: {runtime}")
+        for scenario_dir in sorted(scenarios_dir.iterdir()):
+            if scenario_dir.is_dir() and (scenario_dir / "spec.yaml").exists():
+                if not validate_spec_counts(runtime, scenario_dir.resolve()):
+                    success = False
+
+    sys.exit(0 if success else 1)
+
+
+if __name__ == "__main__":
+    main()
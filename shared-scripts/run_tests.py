@@ -3,13 +3,16 @@
 Main integration test runner.
 
 Discovers test scenarios under scenarios/<ecosystem>/, executes the Exhort CLI
-(component, stack, stack --summary, stack --html, license) against each one,
-and validates responses against the expected values in spec.yaml.
+(component, stack, stack --summary, stack --html, license) against a private
+copy of each one (see scenario_workspace.py), and validates responses against
+the expected values in spec.yaml.
 
-Usage: python run_tests.py <language> <cli_dir> <runtime>
+Usage: python run_tests.py <language> <cli_dir> <runtime> [--batch]
   language:  "java" or "javascript" — determines CLI invocation style
   cli_dir:   directory containing cli.jar (Java) or cli.tgz (JavaScript)
   runtime:   ecosystem runtime identifier (e.g. "maven", "npm", "cargo-stable")
+  --batch:   run every command for all scenarios inside one long-lived CLI
+             process (see batch_driver.py) instead of one process per command
 """
 
 import os
@@ -17,15 +20,19 @@ import sys
 import json
 import yaml
 import subprocess
-import platform
+from contextlib import ExitStack
 from pathlib import Path
 from typing import Dict, Any, List, Optional
 
 from common_test_functions import (
     get_manifest_file,
     get_scenario_base_dir,
-    get_commands
+    get_commands,
+    get_transitive_key
 )
+from batch_driver import get_batch_requests, run_batch
+from lockfile_oracle import validate_scanned
+from scenario_workspace import scenario_workspace
 
 VALID_LICENSE_CATEGORIES = {"PERMISSIVE", "WEAK_COPYLEFT", "STRONG_COPYLEFT", "UNKNOWN"}
 
@@ -41,19 +48,6 @@ LICENSE_SUMMARY_FIELDS = [
 ]
 
 
-def get_os_name() -> str:
-    """Map platform.system() to OS name for spec.yaml overrides."""
-    system = platform.system()
-    if system == "Windows":
-        return "windows"
-    elif system == "Darwin":
-        return "macos"
-    elif system == "Linux":
-        return "linux"
-    else:
-        return "unknown"
-
-
 def validate_analysis(output: Dict[str, Any], spec: Dict[str, Any], analysis_type: str) -> bool:
     """Validate analysis results using structural and invariant checks."""
     if not output or not isinstance(output, dict):
@@ -85,18 +79,9 @@ def validate_analysis(output: Dict[str, Any], spec: Dict[str, Any], analysis_typ
             ok = False
 
     # Deterministic: transitive count must match exactly (with OS-specific override support)
-    os_name = get_os_name()
-    transitive_key = f"transitive_{os_name}"
-
-    # Check for OS-specific override first, then fall back to base transitive
-    if transitive_key in exp_scanned:
+    transitive_key = get_transitive_key(exp_scanned)
+    if transitive_key is not None:
         expected_transitive = exp_scanned[transitive_key]
-    elif "transitive" in exp_scanned:
-        expected_transitive = exp_scanned["transitive"]
-    else:
-        expected_transitive = None
-
-    if expected_transitive is not None:
         if scanned.get("transitive") != expected_transitive:
             print(f"  FAIL {analysis_type} scanned.transitive: expected {expected_transitive}, "
                   f"got {scanned.get('transitive')}")
@@ -341,8 +326,13 @@ def validate_html_output(output: str) -> bool:
     return True
 
 
-def run_scenario(language: str, cli_dir: str, scenario_dir: Path, runtime: str) -> bool:
-    """Run a single scenario and validate its results."""
+def run_scenario(language: str, cli_dir: str, scenario_dir: Path, runtime: str, workspace_dir: Path,
+                 batch_results: Optional[Dict[str, subprocess.CompletedProcess]] = None) -> bool:
+    """Run a single scenario against its private workspace copy and validate its results.
+
+    When batch_results is given, each command's result is taken from it (keyed
+    by command string) instead of launching the CLI for that command.
+    """
     spec_file = scenario_dir / "spec.yaml"
     if not spec_file.exists():
         print(f"  FAIL No spec.yaml found for scenario: {scenario_dir}")
@@ -358,12 +348,18 @@ def run_scenario(language: str, cli_dir: str, scenario_dir: Path, runtime: str)
     print(f"Expect success: {spec['expect_success']}")
 
     manifest_file = get_manifest_file(runtime)
-    commands = get_commands(language, cli_dir, str(scenario_dir), manifest_file)
+    commands = get_commands(language, cli_dir, str(workspace_dir), manifest_file)
 
     for cmd in commands:
-        print(f"Executing: {cmd}")
+        if batch_results is not None:
+            print(f"Batch result for: {cmd}")
+        else:
+            print(f"Executing: {cmd}")
         try:
-            result = subprocess.run(cmd, shell=True, capture_output=True, text=True)
+            if batch_results is not None:
+                result = batch_results[cmd]
+            else:
+                result = subprocess.run(cmd, shell=True, capture_output=True, text=True)
 
             if spec["expect_success"]:
                 if result.returncode == 0:
@@ -391,7 +387,15 @@ def run_scenario(language: str, cli_dir: str, scenario_dir: Path, runtime: str)
                                     return False
                         elif "stack" in cmd and not any(flag in cmd for flag in ["--summary", "--html"]):
                             print("Validating stack analysis...")
-                            if not validate_analysis(output, spec, "stack_analysis"):
+                            # Check the CLI against the lockfile independently of spec.yaml, so a
+                            # disagreement shows whether the spec drifted or the CLI is wrong
+                            lockfile_ok = True
+                            if isinstance(output, dict) and isinstance(output.get("scanned"), dict):
+                                lockfile_ok = validate_scanned(output["scanned"],
+                                                               spec["stack_analysis"].get("scanned", {}),
+                                                               runtime, scenario_dir)
+                            analysis_ok = validate_analysis(output, spec, "stack_analysis")
+                            if not (lockfile_ok and analysis_ok):
                                 return False
                     except json.JSONDecodeError:
                         print("  FAIL Failed to parse command output as JSON")
@@ -419,13 +423,14 @@ def run_scenario(language: str, cli_dir: str, scenario_dir: Path, runtime: str)
 
 
 def main():
-    if len(sys.argv) != 4:
-        print("Usage: run_tests.py <language> <cli_dir> <runtime>")
+    if len(sys.argv) not in (4, 5) or (len(sys.argv) == 5 and sys.argv[4] != "--batch"):
+        print("Usage: run_tests.py <language> <cli_dir> <runtime> [--batch]")
         sys.exit(1)
 
     language = sys.argv[1]
     cli_dir = sys.argv[2]
     runtime = sys.argv[3]
+    batch = len(sys.argv) == 5
 
     script_dir = Path(__file__).parent
     scenarios_dir = script_dir.parent / "scenarios" / get_scenario_base_dir(runtime)
@@ -434,13 +439,32 @@ def main():
         print(f"No scenarios found for runtime: {runtime}")
         sys.exit(0)
 
+    scenario_dirs = [scenario_dir.resolve() for scenario_dir in scenarios_dir.iterdir()
+                     if scenario_dir.is_dir() and (scenario_dir / "spec.yaml").exists()]
+
     success = True
-    for scenario_dir in scenarios_dir.iterdir():
-        if scenario_dir.is_dir() and (scenario_dir / "spec.yaml").exists():
-            normalized_scenario_dir = scenario_dir.resolve()
-            if not run_scenario(language, cli_dir, normalized_scenario_dir, runtime):
-                success = False
-                break
+    if batch:
+        # Every workspace must outlive the single batch run that uses them all
+        with ExitStack() as workspaces:
+            workspace_dirs = [workspaces.enter_context(scenario_workspace(scenario_dir))
+                              for scenario_dir in scenario_dirs]
+            manifest_file = get_manifest_file(runtime)
+            requests = []
+            for workspace_dir in workspace_dirs:
+                commands = get_commands(language, cli_dir, str(workspace_dir), manifest_file)
+                requests.extend(get_batch_requests(commands, str(workspace_dir / manifest_file)))
+            batch_results = run_batch(language, cli_dir, requests)
+
+            for scenario_dir, workspace_dir in zip(scenario_dirs, workspace_dirs):
+                if not run_scenario(language, cli_dir, scenario_dir, runtime, workspace_dir, batch_results):
+                    success = False
+                    break
+    else:
+        for scenario_dir in scenario_dirs:
+            with scenario_workspace(scenario_dir) as workspace_dir:
+                if not run_scenario(language, cli_dir, scenario_dir, runtime, workspace_dir):
+                    success = False
+                    break
 
     sys.exit(0 if success else 1)
 
@@ -21,6 +21,7 @@ from common_test_functions import (
     get_commands,
     get_package_manager
 )
+from scenario_workspace import scenario_workspace
 
 def run_no_runtime_test(language: str, cli_dir: str, runtime: str) -> bool:
     """Run the no-runtime test for a specific runtime."""
@@ -43,7 +44,12 @@ def run_no_runtime_test(language: str, cli_dir: str, runtime: str) -> bool:
     print(f"Manifest: {scenario_dir / get_manifest_file(runtime)}")
     print("Expecting failure (no runtime available)")
     
-    all_commands = get_commands(language, cli_dir, str(scenario_dir), get_manifest_file(runtime))
+    with scenario_workspace(scenario_dir) as workspace_dir:
+        return run_commands_without_runtime(language, cli_dir, runtime, workspace_dir)
+
+def run_commands_without_runtime(language: str, cli_dir: str, runtime: str, workspace_dir: Path) -> bool:
+    """Run the CLI commands against a scenario workspace with every runtime hidden."""
+    all_commands = get_commands(language, cli_dir, str(workspace_dir), get_manifest_file(runtime))
 
     # Skip the standalone license command — it may succeed without a runtime
     # since it can read the manifest file directly without resolving dependencies
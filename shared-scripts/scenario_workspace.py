@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Private, throwaway copies of scenario directories.
+
+The CLI and the package managers it drives write into the scenario directory
+itself (gradle's .gradle/ state, yarn-berry's .yarn/install-state.gz and
+.pnp.cjs, cargo's target/). Running each execution against its own copy keeps
+the checkout clean and lets runs of the same scenario overlap safely.
+
+Copies are made as cheaply as the filesystem allows:
+  reflink:   copy-on-write clone (Linux FICLONE, macOS clonefile), used for
+             every file when supported
+  hardlink:  fallback only for files known to be read-only (READ_ONLY_NAMES);
+             anything else, manifests included, may be rewritten in place by a
+             package manager, which would write through a hardlink to the checkout
+  copy:      full copy when neither is possible
+
+Workspaces live under WORKSPACE_ROOT, next to the scenarios, so that they share
+a filesystem with them (a requirement for both reflinks and hardlinks). The root
+is gitignored and never removed, so concurrent runs can't race on it.
+"""
+
+import errno
+import os
+import shutil
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator
+
+WORKSPACE_ROOT = Path(__file__).parent.parent / ".scenario-workspaces"
+
+# Files, and directories whose contents, no tool ever writes; only these may be
+# hardlinked when the filesystem can't reflink
+READ_ONLY_NAMES = {"spec.yaml", "src"}
+
+# Linux ioctl request number for FICLONE (_IOW(0x94, 9, int))
+FICLONE = 0x40049409
+
+# errno values meaning "this filesystem can't do that", as opposed to a real error
+UNSUPPORTED_ERRNOS = {errno.EXDEV, errno.EOPNOTSUPP, errno.ENOTTY, errno.EINVAL, errno.EPERM, errno.ENOSYS}
+
+
+def reflink(src: Path, dst: Path) -> None:
+    """Clone src to dst with copy-on-write, raising OSError if unsupported."""
+    if sys.platform.startswith("linux"):
+        import fcntl
+        with open(src, "rb") as src_file, open(dst, "wb") as dst_file:
+            try:
+                fcntl.ioctl(dst_file.fileno(), FICLONE, src_file.fileno())
+            except OSError:
+                dst_file.close()
+                os.unlink(dst)
+                raise
+    elif sys.platform == "darwin":
+        import ctypes
+        libc = ctypes.CDLL(None, use_errno=True)
+        if libc.clonefile(os.fsencode(src), os.fsencode(dst), 0) != 0:
+            err = ctypes.get_errno()
+            raise OSError(err, os.strerror(err), str(src))
+    else:
+        raise OSError(errno.EOPNOTSUPP, "reflinks not supported on this platform", str(src))
+    shutil.copystat(src, dst)
+
+
+def copy_tree(src_dir: Path, dst_dir: Path) -> Dict[str, int]:
+    """Copy src_dir to dst_dir using reflinks or hardlinks where possible."""
+    stats = {"files": 0, "reflinked": 0, "hardlinked": 0, "copied": 0, "bytes_copied": 0}
+    can_reflink = True
+    can_hardlink = True
+
+    for root, dirs, files in os.walk(src_dir):
+        rel_root = Path(root).relative_to(src_dir)
+        read_only_dir = any(part in READ_ONLY_NAMES for part in rel_root.parts)
+        (dst_dir / rel_root).mkdir(parents=True, exist_ok=True)
+
+        for name in dirs:
+            src = Path(root) / name
+            if src.is_symlink():
+                os.symlink(os.readlink(src), dst_dir / rel_root / name)
+        dirs[:] = [name for name in dirs if not (Path(root) / name).is_symlink()]
+
+        for name in files:
+            src = Path(root) / name
+            dst = dst_dir / rel_root / name
+            stats["files"] += 1
+
+            if src.is_symlink():
+                os.symlink(os.readlink(src), dst)
+                continue
+
+            if can_reflink:
+                try:
+                    reflink(src, dst)
+                    stats["reflinked"] += 1
+                    continue
+                except OSError as e:
+                    if e.errno not in UNSUPPORTED_ERRNOS:
+                        raise
+                    can_reflink = False
+
+            if can_hardlink and (read_only_dir or name in READ_ONLY_NAMES):
+                try:
+                    os.link(src, dst)
+                    stats["hardlinked"] += 1
+                    continue
+                except OSError as e:
+                    if e.errno not in UNSUPPORTED_ERRNOS:
+                        raise
+                    can_hardlink = False
+
+            shutil.copy2(src, dst)
+            stats["copied"] += 1
+            stats["bytes_copied"] += src.stat().st_size
+
+    return stats
+
+
+def warn_leaked(function, path, exc) -> None:
+    """shutil.rmtree error handler: report files that could not be removed.
+
+    Serves as both onexc (Python 3.12+, passed the exception) and onerror
+    (older versions, passed an exc_info tuple).
+    """
+    error = exc[1] if isinstance(exc, tuple) else exc
+    print(f"  WARN Could not remove workspace path {path}: {error}")
+
+
+def remove_workspace(workspace_parent: Path) -> None:
+    """Remove a workspace, warning about anything left behind."""
+    if sys.version_info >= (3, 12):
+        shutil.rmtree(workspace_parent, onexc=warn_leaked)
+    else:
+        shutil.rmtree(workspace_parent, onerror=warn_leaked)
+
+
+@contextmanager
+def scenario_workspace(scenario_dir: Path) -> Iterator[Path]:
+    """Yield a private copy of scenario_dir, removing it on exit."""
+    WORKSPACE_ROOT.mkdir(exist_ok=True)
+    workspace_parent = Path(tempfile.mkdtemp(prefix=f"{scenario_dir.parent.name}-", dir=WORKSPACE_ROOT))
+    # Keep the scenario's own directory name; some tools derive project names from it
+    workspace_dir = workspace_parent / scenario_dir.name
+
+    try:
+        start = time.perf_counter()
+        stats = copy_tree(scenario_dir, workspace_dir)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        print(f"Workspace: {workspace_dir} ({stats['files']} files: {stats['reflinked']} reflinked, "
+              f"{stats['hardlinked']} hardlinked, {stats['copied']} copied; "
+              f"{stats['bytes_copied']} bytes copied in {elapsed_ms:.1f} ms)")
+        yield workspace_dir
+    finally:
+        # WORKSPACE_ROOT itself is gitignored and left in place: removing it
+        # could race with a concurrent run that is about to create its workspace
+        remove_workspace(workspace_parent)